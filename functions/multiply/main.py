@@ -1,8 +1,17 @@
 #!/usr/bin/env python
 import argparse
+import functools
 import json
+import math
+import os
+import re
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
+
+MANIFEST_PATH = Path(__file__).resolve().parent / "manifest.json"
+
+# A top-level JSON number is also a valid Python float literal.
+_JSON_NUMBER = re.compile(rb"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?")
 
 
 def parse_args() -> argparse.Namespace:
@@ -52,24 +61,50 @@ def get_port_names(manifest: Dict[str, Any]) -> (List[str], List[str]):
     return input_names, output_names
 
 
-def _load_single_number_from_port(port_dir: Path) -> float:
+@functools.lru_cache(maxsize=None)
+def resolve_port_names() -> Tuple[str, str, str]:
     """
-    Load a single number from the first .json file in port_dir.
-    The JSON document must be a top-level number.
+    Return (first input, second input, first output) port names from the
+    manifest next to this script. The manifest is static, so it is parsed
+    once per process and reused when the runner calls main() again.
+    """
+    input_names, output_names = get_port_names(load_manifest(MANIFEST_PATH))
+    return input_names[0], input_names[1], output_names[0]
+
+
+def _json_files_in_port(port_dir: Path) -> List[Path]:
+    """
+    Sorted .json files in port_dir; raises if there are none.
     """
     if not port_dir.is_dir():
         raise RuntimeError(f"Input port directory does not exist: {port_dir}")
 
-    json_files = sorted(
-        f for f in port_dir.iterdir()
-        if f.is_file() and f.suffix.lower() == ".json"
-    )
+    with os.scandir(port_dir) as it:
+        json_files = sorted(
+            Path(entry.path) for entry in it
+            if entry.name.lower().endswith(".json") and entry.is_file()
+        )
     if not json_files:
         raise RuntimeError(f"No JSON files found in input port directory: {port_dir}")
+    return json_files
+
+
+def _read_number(src: Path) -> float:
+    """
+    Read one JSON document that must be a top-level number.
+    """
+    try:
+        raw = src.read_bytes()
+    except Exception as e:
+        raise RuntimeError(f"Failed to parse JSON from {src}: {e}") from e
+
+    # Fast path: a bare number needs no JSON parser.
+    stripped = raw.strip()
+    if _JSON_NUMBER.fullmatch(stripped):
+        return float(stripped)
 
-    src = json_files[0]
     try:
-        data = json.loads(src.read_text(encoding="utf-8"))
+        data = json.loads(raw)
     except Exception as e:
         raise RuntimeError(f"Failed to parse JSON from {src}: {e}") from e
 
@@ -81,21 +116,37 @@ def _load_single_number_from_port(port_dir: Path) -> float:
     return float(data)
 
 
+def _load_single_number_from_port(port_dir: Path) -> float:
+    """
+    Load a single number from the first .json file in port_dir.
+    The JSON document must be a top-level number.
+    """
+    return _read_number(_json_files_in_port(port_dir)[0])
+
+
+def _write_bytes(path: Path, payload: bytes) -> None:
+    """
+    Write payload to path with one open and (for small payloads) one write,
+    bypassing the text I/O layer.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
 def main() -> int:
     args = parse_args()
 
     inputs_dir = Path(args.inputs_dir)
     outputs_dir = Path(args.outputs_dir)
 
-    # Load manifest next to this script
-    manifest_path = Path(__file__).resolve().parent / "manifest.json"
-    manifest = load_manifest(manifest_path)
-
-    input_names, output_names = get_port_names(manifest)
-
     # For this multiply function, use the first two inputs and the first output.
-    in1_name, in2_name = input_names[0], input_names[1]
-    out_name = output_names[0]
+    in1_name, in2_name, out_name = resolve_port_names()
 
     in1_dir = inputs_dir / in1_name
     in2_dir = inputs_dir / in2_name
@@ -104,12 +155,17 @@ def main() -> int:
     value2 = _load_single_number_from_port(in2_dir)
 
     result = value1 * value2
+    # JSON has no NaN/Infinity (same as json.dumps(..., allow_nan=False)).
+    if not math.isfinite(result):
+        raise RuntimeError(f"Result is not a finite number: {result!r}")
 
     out_dir = outputs_dir / out_name
     out_dir.mkdir(parents=True, exist_ok=True)
     out_file = out_dir / "result.json"
 
-    out_file.write_text(json.dumps(result), encoding="utf-8")
+    # The output schema is a single number: for finite floats repr() is exactly
+    # the JSON text, so the generic encoder is not needed.
+    _write_bytes(out_file, repr(result).encode("ascii"))
 
     return 0
 
@@ -1,13 +1,16 @@
 import argparse
+import os
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from pathlib import Path
 from typing import Dict, List, Optional
 
-from .functions import run_function
+from .functions import ensure_all_function_dependencies, run_function
 from .env_utils import ensure_core_dependencies, load_dotenv_if_present
 from .errors import RunnerError, print_error, print_info
 from .fs_utils import clear_directory_contents
 from .paths import FUNCTIONS_ROOT
 from .copy_ops import execute_copy
-from .workflow import WorkflowCommand, parse_workflow
+from .workflow import CopyCommand, WorkflowCommand, parse_workflow
 
 
 def clean_generated() -> None:
@@ -17,35 +20,89 @@ def clean_generated() -> None:
 
     print_info("Cleaning generated inputs/outputs under functions/...")
 
-    for entry in FUNCTIONS_ROOT.iterdir():
-        if not entry.is_dir():
-            continue
-        inputs_dir = entry / "inputs"
-        outputs_dir = entry / "outputs"
+    with os.scandir(FUNCTIONS_ROOT) as it:
+        function_dirs = [Path(entry.path) for entry in it if entry.is_dir()]
+
+    for function_dir in function_dirs:
+        # One readdir per function instead of a stat() per candidate folder.
+        with os.scandir(function_dir) as it:
+            generated_dirs = [
+                Path(entry.path)
+                for entry in it
+                if entry.name in ("inputs", "outputs") and entry.is_dir()
+            ]
 
-        for d in (inputs_dir, outputs_dir):
-            if d.is_dir():
-                clear_directory_contents(d)
+        for d in generated_dirs:
+            clear_directory_contents(d)
 
     print_info("Clean complete.")
 
 
-def execute_workflow(commands: List[WorkflowCommand]) -> None:
+def _execute_copies(
+    copies: List[CopyCommand],
+    node_to_functions: Dict[str, str],
+    incremental: bool,
+) -> None:
+    """
+    Execute a run of consecutive copy commands (no run step in between).
+
+    Copies only read workflow inputs/ or function outputs and only write
+    outputs/ or function inputs, so within such a run they are independent
+    unless two of them target the same destination. Independent copies are
+    I/O-bound and overlap on a thread pool; otherwise they run in order.
+    Copies not yet started when one fails are skipped, and the error of the
+    first failing copy in workflow order is raised.
+    """
+    destinations = {cmd.dest_endpoint for cmd in copies}
+    if len(copies) <= 1 or len(destinations) != len(copies):
+        for cmd in copies:
+            execute_copy(cmd, node_to_functions, incremental)
+        return
+
+    max_workers = min(8, (os.cpu_count() or 1) * 2, len(copies))
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        futures = [
+            ex.submit(execute_copy, cmd, node_to_functions, incremental)
+            for cmd in copies
+        ]
+        # Stop starting further copies once one has failed; copies already
+        # running are left to finish.
+        wait(futures, return_when=FIRST_EXCEPTION)
+        for future in futures:
+            future.cancel()
+    for future in futures:
+        if not future.cancelled():
+            future.result()
+
+
+def execute_workflow(commands: List[WorkflowCommand], incremental: bool = False) -> None:
     node_to_functions: Dict[str, str] = {}
+    pending_copies: List[CopyCommand] = []
+
+    ensure_all_function_dependencies(
+        cmd.function_name for kind, cmd in commands if kind == "run"
+    )
 
     for kind, cmd in commands:
+        if kind == "copy":
+            pending_copies.append(cmd)
+            continue
+
+        # Every other command is a barrier for the copies before it.
+        _execute_copies(pending_copies, node_to_functions, incremental)
+        pending_copies = []
+
         if kind == "run":
             functions_name = cmd.function_name
             node_name = cmd.node_name
             node_to_functions[node_name] = functions_name
             run_function(functions_name, node_name)
 
-        elif kind == "copy":
-            execute_copy(cmd, node_to_functions)
-
         else:
             raise RunnerError(f"Internal error: unknown command kind '{kind}'.")
 
+    _execute_copies(pending_copies, node_to_functions, incremental)
+
     print_info("Workflow completed successfully.")
 
 
@@ -58,6 +115,11 @@ def main(argv: Optional[List[str]] = None) -> int:
         action="store_true",
         help="Remove generated function inputs/outputs and exit.",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Keep unchanged files in outputs/<folder>/json/ instead of recopying them.",
+    )
     args = parser.parse_args(argv)
 
     try:
@@ -77,7 +139,7 @@ def main(argv: Optional[List[str]] = None) -> int:
     try:
         ensure_core_dependencies()
         commands = parse_workflow()
-        execute_workflow(commands)
+        execute_workflow(commands, incremental=args.incremental)
     except RunnerError as e:
         print_error(str(e))
         return 1
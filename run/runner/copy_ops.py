@@ -1,16 +1,31 @@
-import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Tuple
 
 from .functions import ensure_node_io_dirs
 from .errors import RunnerError, print_info
 from .exporters import export_csv, export_json, export_xlsx
-from .fs_utils import clear_directory_contents, list_files_in_dir
+from .fs_utils import (
+    MAX_IO_WORKERS,
+    batch_copy,
+    clear_directory_contents,
+    list_files_in_dir,
+)
+from .jsonio import loads
 from .manifests import load_manifest_for_function
 from .paths import FUNCTIONS_ROOT, WORKFLOW_ROOT
-from .schema_utils import load_schema_for_id, validate_json_against_schema
-from .workflow import CopyCommand, Endpoint, parse_endpoint
+from .schema_utils import (
+    get_validate_fn,
+    validate_json_against_schema,
+    validate_many_against_schema,
+)
+from .workflow import CopyCommand, Endpoint
+
+
+# Serializes calls into the external converters module.
+_convert_lock = threading.Lock()
 
 
 def convert_file_to_schema(
@@ -36,22 +51,24 @@ def convert_file_to_schema(
 
     env = os.environ.copy()
 
+    # Copies may run concurrently, but converters is not known to be
+    # thread-safe and calls a rate-limited API, so conversions run one at a time.
     try:
-        convert_to_schema(
-            source_path=source_path,
-            schema_id=schema_id,
-            dest_path=dest_path,
-            env=env,
-        )
+        with _convert_lock:
+            convert_to_schema(
+                source_path=source_path,
+                schema_id=schema_id,
+                dest_path=dest_path,
+                env=env,
+            )
     except Exception as e:
         raise RunnerError(
             f"Conversion failed for file '{source_path.name}': {e}"
         ) from e
 
     try:
-        schema = load_schema_for_id(schema_id)
-        data = json.loads(dest_path.read_text(encoding="utf-8"))
-        validate_json_against_schema(data, schema)
+        data = loads(dest_path.read_bytes())
+        validate_json_against_schema(data, schema_id)
     except RunnerError:
         raise
     except Exception as e:
@@ -104,6 +121,31 @@ def _resolve_src_dir_for_endpoint(
     return FUNCTIONS_ROOT / src_node / "outputs" / src_port
 
 
+# Marks source files that are not .json or do not parse as JSON.
+_NOT_JSON = object()
+
+
+def _load_json_candidate(src_file: Path) -> Any:
+    """
+    Parsed contents of src_file if it is a .json file holding valid JSON,
+    else _NOT_JSON (the file needs conversion).
+    """
+    if src_file.suffix.lower() != ".json":
+        return _NOT_JSON
+    try:
+        return loads(src_file.read_bytes())
+    except Exception:
+        return _NOT_JSON
+
+
+def _passes(validate: Callable[[Any], None], data: Any) -> bool:
+    try:
+        validate(data)
+    except Exception:
+        return False
+    return True
+
+
 def copy_to_function_input(
     cmd: CopyCommand,
     src_endpoint: Endpoint,
@@ -140,33 +182,43 @@ def copy_to_function_input(
         )
         return
 
-    schema = load_schema_for_id(schema_id)
+    # Parse concurrently (reads release the GIL), then validate the whole port
+    # with one validator call. Only if that fails are the files checked one
+    # by one to find which need conversion.
+    with ThreadPoolExecutor(max_workers=min(MAX_IO_WORKERS, len(files))) as ex:
+        parsed = list(ex.map(_load_json_candidate, files))
 
-    for src_file in files:
+    json_docs = [data for data in parsed if data is not _NOT_JSON]
+    all_conform = bool(json_docs) and _passes(
+        lambda docs: validate_many_against_schema(docs, schema_id), json_docs
+    )
+    validate = get_validate_fn(schema_id)
+
+    validated: List[Tuple[Path, Path]] = []
+    for src_file, data in zip(files, parsed):
         dest_file = dest_dir / src_file.name
-        needs_conversion = True
-
-        if src_file.suffix.lower() == ".json":
-            try:
-                raw = src_file.read_text(encoding="utf-8")
-                data: Any = json.loads(raw)
-                validate_json_against_schema(data, schema)
-                dest_file.write_text(raw, encoding="utf-8")
-                needs_conversion = False
-            except RunnerError:
-                needs_conversion = True
-            except Exception:
-                needs_conversion = True
-
-        if needs_conversion:
+        if data is not _NOT_JSON and (all_conform or _passes(validate, data)):
+            validated.append((src_file, dest_file))
+        else:
             convert_file_to_schema(src_file, schema_id, dest_file)
 
+    # Validated files are byte-identical to their source, so files from the
+    # workflow's inputs/ folders are hard-linked rather than copied. Functions
+    # only read their inputs and must never modify them in place. Function
+    # outputs are always copied: a re-run may overwrite them in place, which
+    # would silently change a linked downstream input.
+    try:
+        batch_copy(validated, hardlink=src_endpoint.kind == "folder")
+    except RunnerError as e:
+        raise RunnerError(f"Error on line {cmd.line_no}: {e}") from e
+
 
 def copy_to_folder(
     cmd: CopyCommand,
     src_endpoint: Endpoint,
     dest_endpoint: Endpoint,
     node_to_function: Dict[str, str],
+    incremental: bool = False,
 ) -> None:
     assert dest_endpoint.kind == "folder"
     folder_name = dest_endpoint.folder_name  # type: ignore
@@ -178,7 +230,7 @@ def copy_to_folder(
 
     for fmt in formats:
         if fmt == "json":
-            export_json(cmd.line_no, src_dir, files, folder_name)
+            export_json(cmd.line_no, src_dir, files, folder_name, incremental)
         elif fmt == "csv":
             export_csv(cmd.line_no, src_dir, files, folder_name)
         elif fmt == "xlsx":
@@ -192,9 +244,10 @@ def copy_to_folder(
 def execute_copy(
     cmd: CopyCommand,
     node_to_function: Dict[str, str],
+    incremental: bool = False,
 ) -> None:
-    src_endpoint = parse_endpoint(cmd.src)
-    dest_endpoint = parse_endpoint(cmd.dest)
+    src_endpoint = cmd.src_endpoint
+    dest_endpoint = cmd.dest_endpoint
 
     if dest_endpoint.kind == "port":
         if cmd.formats is not None:
@@ -204,4 +257,4 @@ def execute_copy(
             )
         copy_to_function_input(cmd, src_endpoint, dest_endpoint, node_to_function)
     else:
-        copy_to_folder(cmd, src_endpoint, dest_endpoint, node_to_function)
+        copy_to_folder(cmd, src_endpoint, dest_endpoint, node_to_function, incremental)
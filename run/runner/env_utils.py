@@ -1,11 +1,27 @@
+import hashlib
+import mmap
 import os
+import re
+import shutil
 import subprocess
 import sys
 from pathlib import Path
+from typing import Dict, List, Tuple
 
 from .errors import RunnerError, print_error, print_info
 from .paths import CORE_REQUIREMENTS, WORKFLOW_ROOT
 
+# One KEY=VALUE assignment per line; comments and blank lines never match
+# because the pattern anchors on an identifier. Value is double-quoted,
+# single-quoted or bare (groups 2, 3, 4 respectively).
+_DOTENV_LINE = re.compile(
+    rb"(?m)^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*"
+    rb"(?:\"([^\"\n]*)\"|'([^'\n]*)'|([^\n]*?))[ \t\r]*$"
+)
+
+# (path, st_mtime_ns, st_size) -> requirements.txt SHA-256 hex digest
+_req_hash_cache: Dict[Tuple[str, int, int], str] = {}
+
 
 def load_dotenv_if_present() -> None:
     """
@@ -18,39 +34,125 @@ def load_dotenv_if_present() -> None:
     if not env_path.is_file():
         return
 
+    # Collect first, then apply in one update: the first assignment of a key
+    # wins, and variables already set in the environment are left alone.
+    parsed: Dict[str, str] = {}
     try:
-        for line in env_path.read_text(encoding="utf-8").splitlines():
-            line = line.strip()
-            if not line or line.startswith("#"):
-                continue
-            if "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip()
-            if (value.startswith('"') and value.endswith('"')) or (
-                value.startswith("'") and value.endswith("'")
-            ):
-                value = value[1:-1]
-            if key and key not in os.environ:
-                os.environ[key] = value
-    except Exception as e:
+        with env_path.open("rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # mmap cannot map an empty file
+                return
+            # Scan the mapped file directly; re accepts any buffer object.
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for m in _DOTENV_LINE.finditer(mm):
+                    quoted_double, quoted_single, bare = m.group(2, 3, 4)
+                    if quoted_double is not None:
+                        value = quoted_double
+                    elif quoted_single is not None:
+                        value = quoted_single
+                    else:
+                        value = bare
+                    parsed.setdefault(m[1].decode("utf-8"), value.decode("utf-8"))
+    except (OSError, UnicodeDecodeError) as e:
         raise RunnerError(f"Failed to load .env: {e}") from e
 
+    os.environ.update(
+        {key: value for key, value in parsed.items() if key not in os.environ}
+    )
+
+
+def compute_requirements_hash(req_path: Path) -> str:
+    """
+    SHA-256 of a requirements.txt and the running interpreter, stored in
+    install sentinels so that an edited requirements file, or running under
+    a different Python or venv, triggers a reinstall.
+
+    The file is normalised first (blank and comment lines dropped, remaining
+    lines stripped and sorted), so cosmetic edits do not force a reinstall.
+    Memoized per (path, mtime, size), so every node of a function after the
+    first costs one stat().
+    """
+    st = req_path.stat()
+    key = (str(req_path), st.st_mtime_ns, st.st_size)
+    if key in _req_hash_cache:
+        return _req_hash_cache[key]
+
+    # Hashed from the normalised text rather than streamed from the file with
+    # hashlib.file_digest: a requirements file is a few hundred bytes and the
+    # digest must ignore formatting.
+    lines = [
+        stripped
+        for line in req_path.read_text(encoding="utf-8").splitlines()
+        if (stripped := line.strip()) and not stripped.startswith("#")
+    ]
+    # Packages are installed into this interpreter, so another interpreter or
+    # venv must not see the requirements as already installed.
+    normalized = "\n".join([sys.executable] + sorted(lines)).encode("utf-8")
+    digest = hashlib.sha256(normalized, usedforsecurity=False).hexdigest()
+    _req_hash_cache[key] = digest
+    return digest
+
+
+def requirements_installed(sentinel: Path, req_hash: str) -> bool:
+    try:
+        return sentinel.read_text(encoding="utf-8").strip() == req_hash
+    except OSError:
+        return False
+
+
+def mark_requirements_installed(sentinel: Path, req_hash: str) -> None:
+    try:
+        sentinel.write_text(req_hash, encoding="utf-8")
+    except OSError:
+        # Not fatal; deps are installed, we'll just check again next run.
+        pass
+
+
+def pip_install_command(req_paths: List[Path]) -> List[str]:
+    """
+    Command that installs the given requirements files into this interpreter.
+    Uses uv's much faster resolver when uv is on PATH; otherwise pip, without
+    byte-compiling installed modules (they compile lazily on first import).
+    """
+    uv = shutil.which("uv")
+    if uv:
+        cmd = [uv, "pip", "install", "--python", sys.executable]
+    else:
+        cmd = [
+            sys.executable,
+            "-m",
+            "pip",
+            "install",
+            "--no-input",
+            "--disable-pip-version-check",
+            "--no-compile",
+            "--prefer-binary",
+        ]
+    for req_path in req_paths:
+        cmd += ["-r", str(req_path)]
+    return cmd
+
 
 def ensure_core_dependencies() -> None:
     """
     Ensure workflow-level dependencies are installed via requirements.txt.
-    This is intentionally simple: it runs pip install if requirements.txt exists.
+    pip only runs when requirements.txt differs from the last successful
+    install, tracked by a hash sentinel next to it.
     """
     if not CORE_REQUIREMENTS.is_file():
         return
 
+    req_hash = compute_requirements_hash(CORE_REQUIREMENTS)
+    sentinel = CORE_REQUIREMENTS.with_suffix(".installed")
+    if requirements_installed(sentinel, req_hash):
+        return
+
     print_info("Ensuring core dependencies from requirements.txt...")
     try:
-        subprocess.run(
-            [sys.executable, "-m", "pip", "install", "-r", str(CORE_REQUIREMENTS)],
-            check=False,
-        )
+        result = subprocess.run(pip_install_command([CORE_REQUIREMENTS]), check=False)
     except Exception as e:
         print_error(f"Warning: failed to install core requirements: {e}")
+        return
+
+    if result.returncode == 0:
+        mark_requirements_installed(sentinel, req_hash)
@@ -1,40 +1,53 @@
-import json
+import sys
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Tuple
 
 from .errors import RunnerError, print_info
-from .fs_utils import clear_directory_contents, list_files_in_dir
+from .fs_utils import batch_copy, clear_directory_contents, sync_files
+from .jsonio import loads
 from .paths import WORKFLOW_ROOT
 
 
-def ensure_outputs_subdir(folder_name: str, fmt: str) -> Path:
+def ensure_outputs_subdir(folder_name: str, fmt: str, clear: bool = True) -> Path:
     base = WORKFLOW_ROOT / "outputs" / folder_name / fmt
     base.mkdir(parents=True, exist_ok=True)
-    clear_directory_contents(base)
+    if clear:
+        clear_directory_contents(base)
     return base
 
 
-def iter_tabular_rows(src_dir: Path, files: List[Path]) -> Tuple[List[str], List[Dict[str, Any]]]:
+def _flatten_iter(obj: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Load all .json files as tabular data (flattened) and return (columns, rows).
+    Flatten nested objects into a single dict with dot-notation keys.
+    Walks an explicit stack of (key path, object) pairs and only joins the
+    path into a string at the leaves. Leaf keys are interned: the same column
+    names recur on every row, so each one is stored once.
+    """
+    out: Dict[str, Any] = {}
+    stack: List[Tuple[Tuple[str, ...], Dict[str, Any]]] = [((), obj)]
+    while stack:
+        prefix, node = stack.pop()
+        for k, v in node.items():
+            if isinstance(v, dict):
+                stack.append((prefix + (k,), v))
+            elif prefix:
+                out[sys.intern(".".join(prefix + (k,)))] = v
+            else:
+                out[sys.intern(k)] = v
+    return out
+
+
+def _iter_flat_rows(files: List[Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every row of every .json file, flattened, one file in memory at a time.
     - Accepts top-level array or single object.
     - Uses dot-notation for nested keys.
     """
-    rows: List[Dict[str, Any]] = []
-
-    def flatten(prefix: str, obj: Any, out: Dict[str, Any]) -> None:
-        if isinstance(obj, dict):
-            for k, v in obj.items():
-                key = f"{prefix}.{k}" if prefix else k
-                flatten(key, v, out)
-        else:
-            out[prefix] = obj
-
     for f in files:
         if f.suffix.lower() != ".json":
             continue
         try:
-            data = json.loads(f.read_text(encoding="utf-8"))
+            data = loads(f.read_bytes())
         except Exception as e:
             raise RunnerError(
                 f"File '{f}' is not valid JSON for tabular export: {e}"
@@ -47,35 +60,59 @@ def iter_tabular_rows(src_dir: Path, files: List[Path]) -> Tuple[List[str], List
                 raise RunnerError(
                     f"File '{f}' contains a non-object row during tabular export."
                 )
-            flat: Dict[str, Any] = {}
-            flatten("", obj, flat)
-            rows.append(flat)
+            yield _flatten_iter(obj)
+
 
+def scan_columns(files: List[Path]) -> List[str]:
+    """
+    First pass over the files: the sorted union of all flattened keys.
+    Rows are discarded as soon as their keys are collected.
+    """
     cols_set = set()
-    for r in rows:
-        cols_set.update(r.keys())
-    columns = sorted(cols_set)
-    return columns, rows
+    for row in _iter_flat_rows(files):
+        cols_set.update(row)
+    return sorted(cols_set)
+
 
+def stream_rows(files: List[Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Second pass over the files: flattened rows, streamed to the writer.
+    """
+    return _iter_flat_rows(files)
 
-def export_json(line_no: int, src_dir: Path, files: List[Path], folder_name: str) -> None:
-    import shutil
 
-    dest_dir = ensure_outputs_subdir(folder_name, "json")
+def export_json(
+    line_no: int,
+    src_dir: Path,
+    files: List[Path],
+    folder_name: str,
+    incremental: bool = False,
+) -> None:
+    """
+    Copy the source files into outputs/<folder_name>/json/. With incremental,
+    files left from a previous run are kept when unchanged instead of the
+    folder being cleared and fully recopied.
+    """
+    dest_dir = ensure_outputs_subdir(folder_name, "json", clear=not incremental)
     if not files:
+        if incremental:
+            clear_directory_contents(dest_dir)
         print_info(
             f"Copy (json) created empty outputs/{folder_name}/json/ from {src_dir}."
         )
         return
 
-    for f in files:
-        dest_file = dest_dir / f.name
-        try:
-            shutil.copy2(f, dest_file)
-        except Exception as e:
-            raise RunnerError(
-                f"Error on line {line_no}: failed to copy '{f}' to '{dest_file}': {e}"
-            ) from e
+    try:
+        if incremental:
+            sync_files(files, dest_dir)
+        else:
+            batch_copy((f, dest_dir / f.name) for f in files)
+    except OSError as e:
+        raise RunnerError(
+            f"Error on line {line_no}: failed to sync '{src_dir}' to '{dest_dir}': {e}"
+        ) from e
+    except RunnerError as e:
+        raise RunnerError(f"Error on line {line_no}: {e}") from e
 
 
 def export_csv(line_no: int, src_dir: Path, files: List[Path], folder_name: str) -> None:
@@ -84,7 +121,7 @@ def export_csv(line_no: int, src_dir: Path, files: List[Path], folder_name: str)
     dest_dir = ensure_outputs_subdir(folder_name, "csv")
     dest_file = dest_dir / "data.csv"
 
-    columns, rows = iter_tabular_rows(src_dir, files)
+    columns = scan_columns(files)
     if not columns:
         dest_file.write_text("", encoding="utf-8")
         print_info(
@@ -94,10 +131,13 @@ def export_csv(line_no: int, src_dir: Path, files: List[Path], folder_name: str)
 
     try:
         with dest_file.open("w", encoding="utf-8", newline="") as f:
-            writer = csv.DictWriter(f, fieldnames=columns)
-            writer.writeheader()
-            for row in rows:
-                writer.writerow({col: row.get(col, "") for col in columns})
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for row in stream_rows(files):
+                get = row.get
+                writer.writerow([get(col, "") for col in columns])
+    except RunnerError:
+        raise
     except Exception as e:
         raise RunnerError(
             f"Error on line {line_no}: failed to write CSV '{dest_file}': {e}"
@@ -116,19 +156,23 @@ def export_xlsx(line_no: int, src_dir: Path, files: List[Path], folder_name: str
     dest_dir = ensure_outputs_subdir(folder_name, "xlsx")
     dest_file = dest_dir / "data.xlsx"
 
-    columns, rows = iter_tabular_rows(src_dir, files)
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = "data"
-
-    if columns:
-        ws.append(columns)
-        for row in rows:
-            ws.append([row.get(col, "") for col in columns])
+    columns = scan_columns(files)
+    # Write-only mode streams rows to disk instead of holding every cell in memory.
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(title="data")
 
     try:
+        if columns:
+            ws.append(columns)
+            for row in stream_rows(files):
+                ws.append([row.get(col, "") for col in columns])
         wb.save(dest_file)
+    except RunnerError:
+        raise
     except Exception as e:
+        # A write-only sheet raises a bare ValueError() with the actual reason
+        # (e.g. "Cannot convert [1, 2] to Excel") on the exception it replaced.
+        reason = str(e) or str(e.__context__ or "") or type(e).__name__
         raise RunnerError(
-            f"Error on line {line_no}: failed to write Excel '{dest_file}': {e}"
+            f"Error on line {line_no}: failed to write Excel '{dest_file}': {reason}"
         ) from e
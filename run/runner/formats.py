@@ -5,3 +5,8 @@ SUPPORTED_FORMATS = {"json", "csv", "xlsx"}
 FORMAT_ALIASES = {
     "excel": "xlsx",
 }
+
+# Every accepted spelling -> canonical format name, so a format token is
+# resolved with a single lookup.
+RESOLVED_FORMATS = {fmt: fmt for fmt in SUPPORTED_FORMATS}
+RESOLVED_FORMATS.update(FORMAT_ALIASES)
@@ -1,8 +1,29 @@
+import errno
+import os
+import shutil
+import stat
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import Iterable, List, Tuple
 
 from .errors import RunnerError
 
+# Thread count for overlapping small-file I/O; file reads, writes and copies
+# release the GIL, so this can exceed the CPU count.
+MAX_IO_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# os.link failures that just mean "hard links are not possible here".
+_LINK_FALLBACK_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP}
+
+# os.copy_file_range (Linux) failures that mean "use a regular copy instead".
+_COPY_FILE_RANGE_FALLBACK_ERRNOS = {
+    errno.ENOSYS,
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOTSUP,
+    errno.EOPNOTSUPP,
+}
+
 
 def clear_directory_contents(path: Path) -> None:
     """
@@ -16,12 +37,26 @@ def clear_directory_contents(path: Path) -> None:
     if not path.is_dir():
         raise RunnerError(f"Expected directory, found file: {path}")
 
-    for child in path.iterdir():
-        if child.is_dir():
-            import shutil
-            shutil.rmtree(child)
+    try:
+        st = os.lstat(path)
+        owned = not hasattr(os, "geteuid") or st.st_uid == os.geteuid()
+        if stat.S_ISDIR(st.st_mode) and owned:
+            # Dropping and recreating the directory is one tree walk instead
+            # of a Python-level stat + unlink/rmtree per child.
+            shutil.rmtree(path)
+            path.mkdir(parents=True, exist_ok=True)
+            os.chmod(path, stat.S_IMODE(st.st_mode))
         else:
-            child.unlink()
+            # A symlink to a directory, or a directory owned by someone else:
+            # empty it in place so the link, owner and mode are kept.
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                    else:
+                        os.unlink(entry.path)
+    except OSError as e:
+        raise RunnerError(f"Failed to clear directory {path}: {e}") from e
 
 
 def list_files_in_dir(path: Path) -> List[Path]:
@@ -30,4 +65,109 @@ def list_files_in_dir(path: Path) -> List[Path]:
     """
     if not path.is_dir():
         raise RunnerError(f"Source directory does not exist: {path}")
-    return sorted([p for p in path.iterdir() if p.is_file()])
+    # DirEntry.is_file() answers from the cached directory entry type, so
+    # regular files cost no extra stat() call.
+    with os.scandir(path) as it:
+        files = [Path(entry.path) for entry in it if entry.is_file()]
+    files.sort()
+    return files
+
+
+def _copy_file_range(src: Path, dest: Path) -> None:
+    """
+    Copy src to dest inside the kernel (a reflink on filesystems that support
+    it), then carry over permission bits and timestamps on the already-open
+    descriptor, without copystat's extra path lookups and xattr calls.
+    """
+    with open(src, "rb") as fsrc, open(dest, "wb") as fdst:
+        infd, outfd = fsrc.fileno(), fdst.fileno()
+        while os.copy_file_range(infd, outfd, 1 << 30):
+            pass
+        st = os.fstat(infd)
+        os.chmod(outfd, stat.S_IMODE(st.st_mode))
+        os.utime(outfd, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+
+def _copy_pair(pair: Tuple[Path, Path]) -> None:
+    src, dest = pair
+    try:
+        if hasattr(os, "copy_file_range"):
+            try:
+                _copy_file_range(src, dest)
+                return
+            except OSError as e:
+                if e.errno not in _COPY_FILE_RANGE_FALLBACK_ERRNOS:
+                    raise
+        shutil.copy2(src, dest)
+    except OSError as e:
+        raise RunnerError(f"failed to copy '{src}' to '{dest}': {e}") from e
+
+
+def _link_pair(pair: Tuple[Path, Path]) -> None:
+    src, dest = pair
+    try:
+        os.link(src, dest)
+    except OSError as e:
+        if e.errno not in _LINK_FALLBACK_ERRNOS:
+            raise RunnerError(f"failed to link '{src}' to '{dest}': {e}") from e
+        _copy_pair(pair)
+
+
+def batch_copy(pairs: Iterable[Tuple[Path, Path]], hardlink: bool = False) -> None:
+    """
+    Copy every (src, dest) file pair, preserving metadata like shutil.copy2.
+    With hardlink=True, dest is hard-linked to src instead (no bytes moved),
+    falling back to a copy where links are not possible, e.g. across devices.
+    Only use that when nothing will modify dest in place.
+
+    Copies run concurrently on a thread pool; raises RunnerError naming the
+    first pair (in input order) that could not be copied.
+    """
+    transfer = _link_pair if hardlink else _copy_pair
+    pairs = list(pairs)
+    if len(pairs) <= 1:
+        for pair in pairs:
+            transfer(pair)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(MAX_IO_WORKERS, len(pairs))) as ex:
+        for _ in ex.map(transfer, pairs):
+            pass
+
+
+def _remove_entry(entry: os.DirEntry) -> None:
+    if entry.is_dir(follow_symlinks=False):
+        shutil.rmtree(entry.path)
+    else:
+        os.unlink(entry.path)
+
+
+def sync_files(files: List[Path], dest_dir: Path) -> None:
+    """
+    Make dest_dir hold exactly a copy of each file in 'files' (by name),
+    moving as few bytes as possible:
+    - entries whose size and mtime already match their source are kept,
+    - missing or stale entries are copied with batch_copy,
+    - entries with no source file are removed.
+    """
+    with os.scandir(dest_dir) as it:
+        existing = {entry.name: entry for entry in it}
+
+    pending: List[Tuple[Path, Path]] = []
+    for src in files:
+        entry = existing.pop(src.name, None)
+        if entry is not None:
+            if entry.is_file(follow_symlinks=False):
+                dst_st = entry.stat(follow_symlinks=False)
+                src_st = src.stat()
+                if (dst_st.st_size, dst_st.st_mtime_ns) == (src_st.st_size, src_st.st_mtime_ns):
+                    continue
+            else:
+                # Never copy through a symlink or onto a directory.
+                _remove_entry(entry)
+        pending.append((src, dest_dir / src.name))
+
+    for orphan in existing.values():
+        _remove_entry(orphan)
+
+    batch_copy(pending)
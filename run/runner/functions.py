@@ -1,13 +1,78 @@
+import ast
+import contextlib
+import importlib.util
 import os
+import runpy
 import subprocess
 import sys
 from pathlib import Path
-from typing import Tuple
+from types import ModuleType
+from typing import AbstractSet, Dict, Iterable, List, Optional, Tuple
 
-from .errors import RunnerError, print_info
+from .env_utils import (
+    compute_requirements_hash,
+    mark_requirements_installed,
+    pip_install_command,
+    requirements_installed,
+)
+from .errors import RunnerError, print_error, print_info
 from .manifests import load_manifest_for_function
 from .paths import FUNCTIONS_ROOT, SCHEMAS_ROOT
 
+# SCHEMAS_ROOT never changes within a process; resolve it once.
+_SCHEMAS_ROOT_RESOLVED = str(SCHEMAS_ROOT.resolve())
+
+# main.py of function X is imported as module "idm_fn_X".
+_FUNC_MODULE_PREFIX = "idm_fn_"
+
+# main.py modules already imported into this process, keyed by function name;
+# None for a main.py without main(), which is run as a script each time.
+_FUNC_CACHE: Dict[str, Optional[ModuleType]] = {}
+
+
+def _pending_requirements(function_name: str) -> Optional[Tuple[Path, Path, str]]:
+    """
+    (requirements.txt, sentinel, hash) if the function has requirements that
+    are not installed yet, else None.
+    """
+    function_dir = FUNCTIONS_ROOT / function_name
+    req_path = function_dir / "requirements.txt"
+    sentinel = function_dir / ".deps_installed"
+
+    if not req_path.is_file():
+        return None
+
+    req_hash = compute_requirements_hash(req_path)
+    if requirements_installed(sentinel, req_hash):
+        return None
+    return req_path, sentinel, req_hash
+
+
+def _install_function_requirements(
+    function_names: List[str],
+    pending: List[Tuple[Path, Path, str]],
+) -> None:
+    """
+    Install several functions' requirements with one installer run, so it
+    starts and resolves once instead of once per function.
+    """
+    label = ", ".join(f"'{name}'" for name in function_names)
+    if len(function_names) == 1:
+        print_info(f"Installing dependencies for data function {label}...")
+    else:
+        print_info(f"Installing dependencies for data functions {label}...")
+
+    cmd = pip_install_command([req_path for req_path, _, _ in pending])
+    try:
+        subprocess.run(cmd, check=True)
+    except subprocess.CalledProcessError as e:
+        raise RunnerError(
+            f"Failed to install dependencies for data function {label}: {e}"
+        ) from e
+
+    for _, sentinel, req_hash in pending:
+        mark_requirements_installed(sentinel, req_hash)
+
 
 def ensure_function_dependencies(function_name: str) -> None:
     function_dir = FUNCTIONS_ROOT / function_name
@@ -16,25 +81,29 @@ def ensure_function_dependencies(function_name: str) -> None:
             f"Data function directory not found for '{function_name}': {function_dir}"
         )
 
-    req_path = function_dir / "requirements.txt"
-    sentinel = function_dir / ".deps_installed"
+    pending = _pending_requirements(function_name)
+    if pending is not None:
+        _install_function_requirements([function_name], [pending])
 
-    if req_path.is_file() and not sentinel.exists():
-        print_info(f"Installing dependencies for data function '{function_name}'...")
-        try:
-            subprocess.run(
-                [sys.executable, "-m", "pip", "install", "-r", str(req_path)],
-                check=True,
-            )
-        except subprocess.CalledProcessError as e:
-            raise RunnerError(
-                f"Failed to install dependencies for data function '{function_name}': {e}"
-            ) from e
-        try:
-            sentinel.write_text("ok", encoding="utf-8")
-        except Exception:
-            # Not fatal; deps are installed.
-            pass
+
+def ensure_all_function_dependencies(function_names: Iterable[str]) -> None:
+    """
+    Before a workflow starts, install the missing requirements of every
+    function it runs in a single pip invocation. Unknown functions are
+    skipped here and reported when their run step is reached.
+    """
+    names: List[str] = []
+    pending: List[Tuple[Path, Path, str]] = []
+    for function_name in dict.fromkeys(function_names):
+        if not (FUNCTIONS_ROOT / function_name).is_dir():
+            continue
+        entry = _pending_requirements(function_name)
+        if entry is not None:
+            names.append(function_name)
+            pending.append(entry)
+
+    if pending:
+        _install_function_requirements(names, pending)
 
 
 def ensure_node_io_dirs(node_name: str) -> Tuple[Path, Path]:
@@ -46,7 +115,168 @@ def ensure_node_io_dirs(node_name: str) -> Tuple[Path, Path]:
     return inputs_dir, outputs_dir
 
 
+def _defines_main(main_py: Path) -> bool:
+    """
+    True if main.py has a top-level "def main", i.e. it can be imported and
+    its main() called. Checked on the source so a script-style main.py is
+    not executed once just to find out.
+    """
+    try:
+        tree = ast.parse(main_py.read_bytes(), filename=str(main_py))
+    except SyntaxError:
+        # Let the import report it.
+        return True
+    return any(
+        isinstance(node, ast.FunctionDef) and node.name == "main" for node in tree.body
+    )
+
+
+def _load_function_module(function_name: str, main_py: Path) -> Optional[ModuleType]:
+    """
+    Import a data function's main.py once and cache it for later nodes.
+    Returns None for a main.py without a main() function; it is run as a
+    script instead. Must be called with the function directory on sys.path.
+    """
+    if function_name in _FUNC_CACHE:
+        return _FUNC_CACHE[function_name]
+
+    if not _defines_main(main_py):
+        _FUNC_CACHE[function_name] = None
+        return None
+
+    spec = importlib.util.spec_from_file_location(
+        _FUNC_MODULE_PREFIX + function_name, main_py
+    )
+    if spec is None or spec.loader is None:
+        raise RunnerError(f"Cannot import main.py for data function '{function_name}'.")
+
+    module = importlib.util.module_from_spec(spec)
+    # Registered before executing, as a normal import would be, so code that
+    # looks its module up (dataclasses, pickle, typing.get_type_hints) works.
+    sys.modules[spec.name] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception as e:
+        sys.modules.pop(spec.name, None)
+        raise RunnerError(
+            f"Failed to import main.py for data function '{function_name}': {e}"
+        ) from e
+
+    if not callable(getattr(module, "main", None)):
+        # "def main" was rebound to something else; run the file as a script.
+        sys.modules.pop(spec.name, None)
+        module = None
+
+    _FUNC_CACHE[function_name] = module
+    return module
+
+
+def _restore_environ(saved: Dict[str, str]) -> None:
+    for key in [key for key in os.environ if key not in saved]:
+        del os.environ[key]
+    for key, value in saved.items():
+        if os.environ.get(key) != value:
+            os.environ[key] = value
+
+
+def _forget_local_modules(function_dir: Path, before: AbstractSet[str]) -> None:
+    """
+    Remove modules imported from function_dir since 'before' was taken from
+    sys.modules. Third-party packages imported by the function stay cached.
+    """
+    prefix = str(function_dir) + os.sep
+    for name in [name for name in sys.modules if name not in before]:
+        if name.startswith(_FUNC_MODULE_PREFIX):
+            # main.py itself: uniquely named per function and reused by
+            # later nodes from _FUNC_CACHE, so it stays registered.
+            continue
+        module = sys.modules[name]
+        locations = [getattr(module, "__file__", None) or ""]
+        locations += list(getattr(module, "__path__", None) or [])
+        if any(loc.startswith(prefix) for loc in locations):
+            del sys.modules[name]
+
+
+def _run_in_process(
+    function_name: str,
+    node_name: str,
+    main_py: Path,
+    argv: List[str],
+    env: Dict[str, str],
+) -> int:
+    """
+    Call the function's main() (or run a script-style main.py as __main__)
+    inside this interpreter with sys.argv, sys.path and the IDM_* environment
+    swapped the way a fresh child process would see them.
+    """
+    with contextlib.ExitStack() as stack:
+        saved_argv, saved_path = sys.argv, sys.path
+        sys.argv = [str(main_py)] + argv
+        sys.path = [str(main_py.parent)] + saved_path
+        stack.callback(setattr, sys, "argv", saved_argv)
+        stack.callback(setattr, sys, "path", saved_path)
+
+        stack.callback(_restore_environ, os.environ.copy())
+        os.environ.update(env)
+
+        # Drop the function's own helper modules once it is done, so another
+        # function with a same-named helper.py imports its own copy.
+        stack.callback(_forget_local_modules, main_py.parent, set(sys.modules))
+
+        module = _load_function_module(function_name, main_py)
+        try:
+            if module is None:
+                # No main(): run it the way "python main.py" would.
+                runpy.run_path(str(main_py), run_name="__main__")
+                code = None
+            else:
+                code = module.main()
+        except SystemExit as e:
+            code = e.code
+        except Exception as e:
+            raise RunnerError(
+                f"Error running data function '{function_name}' as node '{node_name}': {e}"
+            ) from e
+
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    # Mirror sys.exit("message"): print it and report failure.
+    print_error(str(code))
+    return 1
+
+
+def _run_in_subprocess(
+    function_name: str,
+    node_name: str,
+    main_py: Path,
+    argv: List[str],
+    env: Dict[str, str],
+) -> int:
+    child_env = os.environ.copy()
+    child_env.update(env)
+
+    cmd = [sys.executable, str(main_py)] + argv
+    try:
+        result = subprocess.run(cmd, env=child_env)
+    except Exception as e:
+        raise RunnerError(
+            f"Error running data function '{function_name}' as node '{node_name}': {e}"
+        ) from e
+    return result.returncode
+
+
 def run_function(function_name: str, node_name: str) -> None:
+    """
+    Run a data function as a workflow node.
+
+    Functions run inside the runner process by default; functions whose
+    manifest sets "isolated": true are run as a separate Python process
+    instead. That gives them a fresh interpreter state (sys.modules, cwd,
+    signal handlers...), not separate dependencies: the child uses the same
+    interpreter and site-packages the requirements were installed into.
+    """
     function_dir = FUNCTIONS_ROOT / function_name
     main_py = function_dir / "main.py"
     if not main_py.is_file():
@@ -55,40 +285,46 @@ def run_function(function_name: str, node_name: str) -> None:
         )
 
     # Preload manifest to fail fast if it's malformed
-    load_manifest_for_function(function_name)
+    manifest = load_manifest_for_function(function_name)
     ensure_function_dependencies(function_name)
     inputs_dir, outputs_dir = ensure_node_io_dirs(node_name)
 
-    env = os.environ.copy()
-    env["IDM_FUNCTION_NAME"] = function_name
-    env["IDM_NODE_NAME"] = node_name
-    env["IDM_INPUTS_DIR"] = str(inputs_dir.resolve())
-    env["IDM_OUTPUTS_DIR"] = str(outputs_dir.resolve())
-    env["IDM_SCHEMA_ROOT"] = str(SCHEMAS_ROOT.resolve())
+    if manifest.isolated:
+        # Hand the child process canonical paths.
+        inputs_s = str(inputs_dir.resolve())
+        outputs_s = str(outputs_dir.resolve())
+    else:
+        # Same process and cwd, and FUNCTIONS_ROOT is already absolute.
+        inputs_s = str(inputs_dir)
+        outputs_s = str(outputs_dir)
 
-    cmd = [
-        sys.executable,
-        str(main_py),
+    env = {
+        "IDM_FUNCTION_NAME": function_name,
+        "IDM_NODE_NAME": node_name,
+        "IDM_INPUTS_DIR": inputs_s,
+        "IDM_OUTPUTS_DIR": outputs_s,
+        "IDM_SCHEMA_ROOT": _SCHEMAS_ROOT_RESOLVED,
+    }
+
+    argv = [
         "--function-name",
         function_name,
         "--node-name",
         node_name,
         "--inputs-dir",
-        str(inputs_dir),
+        inputs_s,
         "--outputs-dir",
-        str(outputs_dir),
+        outputs_s,
     ]
 
     print_info(f"Running data function '{function_name}' as node '{node_name}'...")
-    try:
-        result = subprocess.run(cmd, env=env)
-    except Exception as e:
-        raise RunnerError(
-            f"Error running data function '{function_name}' as node '{node_name}': {e}"
-        ) from e
+    if manifest.isolated:
+        returncode = _run_in_subprocess(function_name, node_name, main_py, argv, env)
+    else:
+        returncode = _run_in_process(function_name, node_name, main_py, argv, env)
 
-    if result.returncode != 0:
+    if returncode != 0:
         raise RunnerError(
             f"Error running data function '{function_name}': "
-            f"exit code {result.returncode}."
+            f"exit code {returncode}."
         )
@@ -0,0 +1,32 @@
+import json
+import re
+from typing import Any, Union
+
+# orjson parses several times faster than the stdlib; it is optional.
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+# A run of 20+ digits may be an integer wider than 64 bits, which orjson
+# either turns into a float (losing digits) or rejects, depending on version.
+_WIDE_DIGITS = re.compile(rb"[0-9]{20}")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """
+    json.loads-compatible parser that uses orjson when it can do so exactly.
+
+    Documents that may hold integers wider than 64 bits, and anything orjson
+    rejects (e.g. the NaN/Infinity literals json.loads accepts), are parsed
+    by json.loads.
+    """
+    if orjson is None:
+        return json.loads(data)
+    raw = data.encode("utf-8") if isinstance(data, str) else data
+    if _WIDE_DIGITS.search(raw):
+        return json.loads(raw)
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return json.loads(raw)
@@ -1,9 +1,14 @@
-import json
+import os
+import stat
 from dataclasses import dataclass
-from typing import Dict
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from .errors import RunnerError
+from .jsonio import loads
 from .paths import FUNCTIONS_ROOT
+from .schema_utils import build_validator
 
 
 @dataclass
@@ -12,133 +17,77 @@ class FunctionManifest:
     # Only schema-based ports are tracked here (ports that have a "schema")
     inputs: Dict[str, str]   # port_name -> schema_id
     outputs: Dict[str, str]  # port_name -> schema_id
+    # Run main.py in a fresh Python process (same interpreter and installed
+    # packages) instead of in the runner process
+    isolated: bool = False
 
 
-_manifest_cache: Dict[str, FunctionManifest] = {}
+MANIFEST_SCHEMA_ID = (
+    "https://interoperabledata.org/schemas/function_manifest/function_manifest.schema.json"
+)
+# Bundled with the runner (a copy of schemas/function_manifest/) so manifests
+# load offline; never resolved or downloaded via SCHEMAS_ROOT.
+MANIFEST_SCHEMA_PATH = Path(__file__).resolve().parent / "function_manifest.schema.json"
 
+# function_name -> (manifest.json st_mtime_ns, parsed manifest)
+_manifest_cache: Dict[str, Tuple[int, FunctionManifest]] = {}
+
+
+@lru_cache(maxsize=None)
+def _manifest_validator() -> Callable[[Any], None]:
+    try:
+        schema = loads(MANIFEST_SCHEMA_PATH.read_bytes())
+    except Exception as e:
+        raise RunnerError(
+            f"Failed to load function manifest schema from {MANIFEST_SCHEMA_PATH}: {e}"
+        ) from e
+    return build_validator(MANIFEST_SCHEMA_ID, schema)
 
-def load_manifest_for_function(function_name: str) -> FunctionManifest:
-    if function_name in _manifest_cache:
-        return _manifest_cache[function_name]
 
+def load_manifest_for_function(function_name: str) -> FunctionManifest:
     function_dir = FUNCTIONS_ROOT / function_name
     manifest_path = function_dir / "manifest.json"
-    if not manifest_path.is_file():
+
+    try:
+        st: Optional[os.stat_result] = manifest_path.stat()
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
         raise RunnerError(
             f"Manifest not found for function '{function_name}': {manifest_path}"
         )
 
+    # Re-parse only when manifest.json has changed since it was cached.
+    cached = _manifest_cache.get(function_name)
+    if cached is not None and cached[0] == st.st_mtime_ns:
+        return cached[1]
+
     try:
-        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        manifest = loads(manifest_path.read_bytes())
     except Exception as e:
         raise RunnerError(
             f"Failed to parse manifest for function '{function_name}': {e}"
         ) from e
 
-    if "in" not in manifest or "out" not in manifest:
+    # One schema pass enforces the whole manifest structure (see
+    # function_manifest.schema.json), so ports can be read without further checks.
+    validate = _manifest_validator()
+    try:
+        validate(manifest)
+    except RunnerError as e:
         raise RunnerError(
-            f"Manifest for function '{function_name}' must contain 'in' and 'out' arrays."
-        )
+            f"Manifest for function '{function_name}' is invalid: {e}"
+        ) from e
 
-    inputs: Dict[str, str] = {}
-    outputs: Dict[str, str] = {}
-
-    def _extract_ports(arr, target: Dict[str, str], which: str) -> None:
-        """
-        Populate 'target' with schema-based ports: port_name -> schema_id.
-
-        Manifest schema (per your function_manifest.schema.json):
-
-        inputDescriptor:
-          oneOf:
-            { "name": string, "schema": string }
-            { "name": string, "files": [string, ...] }
-
-        outputDescriptor:
-          oneOf:
-            { "name": string, "schema": string }
-            { "name": string, "file": string }
-        """
-        if not isinstance(arr, list):
-            raise RunnerError(
-                f"Manifest for function '{function_name}': '{which}' must be an array."
-            )
-
-        for port in arr:
-            if not isinstance(port, dict):
-                raise RunnerError(
-                    f"Manifest for function '{function_name}': each entry in '{which}' must be an object."
-                )
-
-            name = port.get("name")
-            if not isinstance(name, str):
-                raise RunnerError(
-                    f"Manifest for function '{function_name}': each port in '{which}' "
-                    f"must have a string 'name'."
-                )
-
-            has_schema = "schema" in port
-            has_files = "files" in port
-            has_file = "file" in port
-
-            # Enforce the oneOf semantics at a basic level
-            if which == "in":
-                if has_schema:
-                    schema = port["schema"]
-                    if not isinstance(schema, str):
-                        raise RunnerError(
-                            f"Manifest for function '{function_name}': port '{name}' in '{which}' "
-                            f"must have 'schema' as a string."
-                        )
-                    # Only schema-based ports are put into the map
-                    target[name] = schema
-                elif has_files:
-                    files = port["files"]
-                    if not isinstance(files, list) or not files or not all(
-                        isinstance(x, str) for x in files
-                    ):
-                        raise RunnerError(
-                            f"Manifest for function '{function_name}': port '{name}' in '{which}' "
-                            f"must have 'files' as a non-empty array of strings."
-                        )
-                    # No schema for this port; it's file-based. We don't add it to 'target'.
-                else:
-                    raise RunnerError(
-                        f"Manifest for function '{function_name}': port '{name}' in '{which}' "
-                        f"must have either 'schema' or 'files'."
-                    )
-
-            elif which == "out":
-                if has_schema:
-                    schema = port["schema"]
-                    if not isinstance(schema, str):
-                        raise RunnerError(
-                            f"Manifest for function '{function_name}': port '{name}' in '{which}' "
-                            f"must have 'schema' as a string."
-                        )
-                    target[name] = schema
-                elif has_file:
-                    file_path = port["file"]
-                    if not isinstance(file_path, str):
-                        raise RunnerError(
-                            f"Manifest for function '{function_name}': port '{name}' in '{which}' "
-                            f"must have 'file' as a string."
-                        )
-                    # File-based output; not added to 'target' (no schema).
-                else:
-                    raise RunnerError(
-                        f"Manifest for function '{function_name}': port '{name}' in '{which}' "
-                        f"must have either 'schema' or 'file'."
-                    )
-            else:
-                # Should never happen; defensive
-                raise RunnerError(
-                    f"Internal error: unknown port list '{which}' in manifest loader."
-                )
-
-    _extract_ports(manifest["in"], inputs, "in")
-    _extract_ports(manifest["out"], outputs, "out")
-
-    fm = FunctionManifest(function_name=function_name, inputs=inputs, outputs=outputs)
-    _manifest_cache[function_name] = fm
+    # Only schema-based ports are tracked; file-based ports have no schema.
+    inputs = {port["name"]: port["schema"] for port in manifest["in"] if "schema" in port}
+    outputs = {port["name"]: port["schema"] for port in manifest["out"] if "schema" in port}
+
+    fm = FunctionManifest(
+        function_name=function_name,
+        inputs=inputs,
+        outputs=outputs,
+        isolated=manifest.get("isolated", False),
+    )
+    _manifest_cache[function_name] = (st.st_mtime_ns, fm)
     return fm
@@ -1,14 +1,41 @@
-import json
-from typing import Any, Dict
+import os
+import shutil
+import threading
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.error import HTTPError
 from urllib.parse import urlparse
-
-import requests  # type: ignore
+from urllib.request import Request, urlopen
 
 from .errors import RunnerError
+from .jsonio import loads
 from .paths import SCHEMAS_ROOT
 
 _jsonschema_module = None
 
+# Schemas are immutable for the lifetime of a run: schema_id -> parsed schema.
+_schema_cache: Dict[str, Dict[str, Any]] = {}
+_schema_cache_lock = threading.Lock()
+
+
+@dataclass
+class _SchemaLoad:
+    """A schema being read or downloaded by one thread, awaited by others."""
+
+    done: threading.Event = field(default_factory=threading.Event)
+    # Set if the load failed; waiters re-raise it instead of retrying.
+    error: Optional[Exception] = None
+
+
+# schema_id -> load in progress
+_schema_inflight: Dict[str, _SchemaLoad] = {}
+
+# (schema_id, many) -> validate(data) callable, built once per schema.
+# many=True validates a list of documents against an array-of-schema wrapper.
+_validator_cache: Dict[Tuple[str, bool], Callable[[Any], None]] = {}
+_validator_cache_lock = threading.Lock()
+
 
 def _ensure_jsonschema_import() -> Any:
     global _jsonschema_module
@@ -26,6 +53,7 @@ def _ensure_jsonschema_import() -> Any:
     return jsonschema
 
 
+@lru_cache(maxsize=1024)
 def _local_path_for_schema_id(schema_id: str):
     """
     Map a schema ID/URL to a local file path under SCHEMAS_ROOT.
@@ -34,17 +62,15 @@ def _local_path_for_schema_id(schema_id: str):
       https://interoperabledata.org/schemas/values/Number.simple.1_0.json
         -> <root>/schemas/values/Number.simple.1_0.json
     """
-    parsed = urlparse(schema_id)
-
-    if parsed.scheme and parsed.netloc:
-        path_part = parsed.path.lstrip("/")  # e.g. "schemas/values/Number.simple.1_0.json"
+    if "://" in schema_id:
+        # e.g. "schemas/values/Number.simple.1_0.json"
+        path_part = urlparse(schema_id).path.lstrip("/")
     else:
         # Treat as plain path-ish string
         path_part = schema_id.lstrip("/")
 
     # Strip leading "schemas/" if present to avoid schemas/schemas/...
-    if path_part.startswith("schemas/"):
-        path_part = path_part[len("schemas/") :]
+    path_part = path_part.removeprefix("schemas/")
 
     return SCHEMAS_ROOT / path_part
 
@@ -60,25 +86,64 @@ def _download_schema(schema_id: str, dest_path) -> None:
             f"it is not a valid URL that can be downloaded."
         )
 
+    request = Request(schema_id, headers={"Accept": "application/json"})
     try:
-        resp = requests.get(schema_id, timeout=10)
+        resp = urlopen(request, timeout=10)
+    except HTTPError as e:
+        raise RunnerError(
+            f"Failed to download schema from '{schema_id}': HTTP {e.code}"
+        ) from e
     except Exception as e:
         raise RunnerError(
             f"Failed to download schema from '{schema_id}': {e}"
         ) from e
 
-    if resp.status_code != 200:
+    with resp:
+        if resp.status != 200:
+            raise RunnerError(
+                f"Failed to download schema from '{schema_id}': HTTP {resp.status}"
+            )
+
+        # Stream into a temporary file next to the target and rename it into
+        # place, so an interrupted download never leaves a truncated schema
+        # that later runs would treat as cached.
+        tmp_path = dest_path.with_name(dest_path.name + ".part")
+        try:
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            fh = open(tmp_path, "wb")
+        except Exception as e:
+            raise RunnerError(
+                f"Downloaded schema from '{schema_id}' but failed to write to '{dest_path}': {e}"
+            ) from e
+
+        try:
+            with fh:
+                shutil.copyfileobj(resp, fh, 64 * 1024)
+            os.replace(tmp_path, dest_path)
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            raise RunnerError(
+                f"Failed to download schema from '{schema_id}' to '{dest_path}': {e}"
+            ) from e
+
+
+def _read_schema(schema_id: str) -> Dict[str, Any]:
+    schema_path = _local_path_for_schema_id(schema_id)
+
+    if not schema_path.is_file():
+        # Attempt to download and cache
+        _download_schema(schema_id, schema_path)
+
+    if not schema_path.is_file():
+        # Still missing after download attempt
         raise RunnerError(
-            f"Failed to download schema from '{schema_id}': HTTP {resp.status_code}"
+            f"Schema file not found for schema ID '{schema_id}': {schema_path}"
         )
 
-    dest_path.parent.mkdir(parents=True, exist_ok=True)
     try:
-        dest_path.write_text(resp.text, encoding="utf-8")
+        return loads(schema_path.read_bytes())
     except Exception as e:
-        raise RunnerError(
-            f"Downloaded schema from '{schema_id}' but failed to write to '{dest_path}': {e}"
-        ) from e
+        raise RunnerError(f"Failed to load schema JSON from {schema_path}: {e}") from e
 
 
 def load_schema_for_id(schema_id: str) -> Dict[str, Any]:
@@ -89,28 +154,223 @@ def load_schema_for_id(schema_id: str) -> Dict[str, Any]:
       1. Map ID to SCHEMAS_ROOT-relative path.
       2. If file exists -> load.
       3. If not, try to download from the schema_id URL, then load.
+
+    Parsed schemas are cached per schema_id. Safe to call from several
+    threads: a schema is read (or downloaded) by one of them only, while
+    the others wait for it and share its result or error; different schemas
+    load concurrently.
     """
-    schema_path = _local_path_for_schema_id(schema_id)
+    schema = _schema_cache.get(schema_id)
+    if schema is not None:
+        return schema
 
-    if not schema_path.is_file():
-        # Attempt to download and cache
-        _download_schema(schema_id, schema_path)
+    with _schema_cache_lock:
+        schema = _schema_cache.get(schema_id)
+        if schema is not None:
+            return schema
+        pending = _schema_inflight.get(schema_id)
+        loading = pending is None
+        if loading:
+            pending = _schema_inflight[schema_id] = _SchemaLoad()
 
-    if not schema_path.is_file():
-        # Still missing after download attempt
-        raise RunnerError(
-            f"Schema file not found for schema ID '{schema_id}': {schema_path}"
-        )
+    if not loading:
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return _schema_cache[schema_id]
 
     try:
-        return json.loads(schema_path.read_text(encoding="utf-8"))
+        schema = _read_schema(schema_id)
+        _schema_cache[schema_id] = schema
+        return schema
     except Exception as e:
-        raise RunnerError(f"Failed to load schema JSON from {schema_path}: {e}") from e
+        pending.error = e
+        raise
+    finally:
+        with _schema_cache_lock:
+            del _schema_inflight[schema_id]
+        pending.done.set()
+
+
+def validate_json_against_schema(data: Any, schema_id: str) -> None:
+    """
+    Validate data against the schema for schema_id using its cached validator.
+    Raises RunnerError if data does not conform.
+    """
+    get_validate_fn(schema_id)(data)
+
+
+def validate_many_against_schema(items: List[Any], schema_id: str) -> None:
+    """
+    Validate a list of documents that must each conform to schema_id, with a
+    single validator call against an array-of-schema wrapper where the schema
+    allows it. Raises RunnerError if any item does not conform.
+    """
+    _get_validator(schema_id, many=True)(items)
+
+
+def get_validate_fn(schema_id: str) -> Callable[[Any], None]:
+    """
+    Return the validate(data) callable for schema_id, building it on first use.
+    The returned callable raises RunnerError when data does not conform.
+
+    Backends are tried in order: jsonschema_rs (native), fastjsonschema
+    (schema compiled to Python code), then jsonschema. The first two are
+    optional; a backend that is not installed or cannot handle the schema
+    is skipped.
+    """
+    return _get_validator(schema_id, many=False)
+
+
+def _array_of(schema: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Wrap schema as {"type": "array", "items": schema}, or return None when
+    the wrapper would not validate items exactly as the schema does.
+
+    Local "#/..." refs in the item schema resolve against the document root,
+    so the definitions they point into are lifted onto the wrapper. Any other
+    root-relative ref ("#", "#/properties/...", anchors, dynamic refs) would
+    point into the wrapper instead, so such schemas are not wrapped.
+    """
+    if not _refs_survive_wrapping(schema):
+        return None
+    wrapped: Dict[str, Any] = {"type": "array", "items": schema}
+    for key in ("$schema", "$defs", "definitions"):
+        if key in schema:
+            wrapped[key] = schema[key]
+    return wrapped
 
 
-def validate_json_against_schema(data: Dict[str, Any], schema: Dict[str, Any]) -> None:
+def _refs_survive_wrapping(node: Any) -> bool:
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key in ("$dynamicRef", "$recursiveRef"):
+                return False
+            if key == "$ref" and isinstance(value, str):
+                if not (
+                    "://" in value
+                    or value.startswith("#/$defs/")
+                    or value.startswith("#/definitions/")
+                ):
+                    return False
+            elif not _refs_survive_wrapping(value):
+                return False
+    elif isinstance(node, list):
+        return all(_refs_survive_wrapping(item) for item in node)
+    return True
+
+
+def _get_validator(schema_id: str, many: bool) -> Callable[[Any], None]:
+    key = (schema_id, many)
+    validate = _validator_cache.get(key)
+    if validate is not None:
+        return validate
+
+    # Loaded outside the lock so that a slow download of one schema does not
+    # hold up validators for the others.
+    schema = load_schema_for_id(schema_id)
+    if many:
+        wrapped = _array_of(schema)
+        if wrapped is None:
+            # Cannot be checked as one array; validate item by item instead.
+            validate_one = _get_validator(schema_id, many=False)
+
+            def validate(items: Any) -> None:
+                for item in items:
+                    validate_one(item)
+
+            with _validator_cache_lock:
+                return _validator_cache.setdefault(key, validate)
+        schema = wrapped
+
+    with _validator_cache_lock:
+        if key not in _validator_cache:
+            _validator_cache[key] = build_validator(schema_id, schema)
+        return _validator_cache[key]
+
+
+def build_validator(schema_id: str, schema: Dict[str, Any]) -> Callable[[Any], None]:
+    """
+    Compile an already-loaded schema into a validate(data) callable, using the
+    first available backend (see get_validate_fn). Not cached.
+    """
+    return (
+        _jsonschema_rs_validator(schema)
+        or _fastjsonschema_validator(schema)
+        or _jsonschema_validator(schema_id, schema)
+    )
+
+
+def _jsonschema_rs_validator(schema: Dict[str, Any]) -> Optional[Callable[[Any], None]]:
+    try:
+        import jsonschema_rs  # type: ignore
+    except ImportError:
+        return None
+
+    try:
+        # "format" is an annotation only, as in jsonschema.
+        validator = jsonschema_rs.validator_for(schema, validate_formats=False)
+    except Exception:
+        # Let the next backend accept or report the schema.
+        return None
+
+    def validate(data: Any) -> None:
+        try:
+            validator.validate(data)
+        except jsonschema_rs.ValidationError as e:
+            raise RunnerError(f"JSON does not conform to schema: {e.message}") from e
+
+    return validate
+
+
+_FASTJSONSCHEMA_DRAFTS = ("/draft-04/", "/draft-06/", "/draft-07/")
+
+
+def _fastjsonschema_validator(schema: Dict[str, Any]) -> Optional[Callable[[Any], None]]:
+    try:
+        import fastjsonschema  # type: ignore
+    except ImportError:
+        return None
+
+    # fastjsonschema implements drafts 4, 6 and 7 only, and would silently
+    # apply draft-07 rules to anything else (including schemas without
+    # $schema, which jsonschema treats as the latest draft).
+    dialect = schema.get("$schema")
+    if not isinstance(dialect, str) or not any(
+        draft in dialect for draft in _FASTJSONSCHEMA_DRAFTS
+    ):
+        return None
+
+    try:
+        # use_default=False: validation must never fill defaults into the data.
+        # use_formats=False: "format" is an annotation only, as in jsonschema.
+        compiled = fastjsonschema.compile(schema, use_default=False, use_formats=False)
+    except fastjsonschema.JsonSchemaDefinitionException:
+        return None
+
+    def validate(data: Any) -> None:
+        try:
+            compiled(data)
+        except fastjsonschema.JsonSchemaValueException as e:
+            raise RunnerError(f"JSON does not conform to schema: {e.message}") from e
+
+    return validate
+
+
+def _jsonschema_validator(schema_id: str, schema: Dict[str, Any]) -> Callable[[Any], None]:
+    # Check the schema once here; jsonschema.validate would repeat it per call.
     jsonschema = _ensure_jsonschema_import()
+    cls = jsonschema.validators.validator_for(schema)
     try:
-        jsonschema.validate(instance=data, schema=schema)
-    except jsonschema.ValidationError as e:
-        raise RunnerError(f"JSON does not conform to schema: {e.message}") from e
+        cls.check_schema(schema)
+    except jsonschema.SchemaError as e:
+        raise RunnerError(f"Schema '{schema_id}' is not a valid JSON Schema: {e.message}") from e
+    validator = cls(schema)
+
+    def validate(data: Any) -> None:
+        try:
+            validator.validate(data)
+        except jsonschema.ValidationError as e:
+            raise RunnerError(f"JSON does not conform to schema: {e.message}") from e
+
+    return validate
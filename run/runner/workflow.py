@@ -1,12 +1,21 @@
 import re
 from dataclasses import dataclass
-from typing import Any, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from .errors import RunnerError
-from .formats import FORMAT_ALIASES, SUPPORTED_FORMATS
+from .formats import RESOLVED_FORMATS
 from .paths import WORKFLOW_FILE
 
 
+@dataclass(frozen=True)
+class Endpoint:
+    kind: str  # "folder" or "port"
+    folder_name: Optional[str] = None
+    node_name: Optional[str] = None
+    port_name: Optional[str] = None
+
+
 @dataclass
 class RunCommand:
     line_no: int
@@ -22,46 +31,36 @@ class CopyCommand:
     src: str
     dest: str
     formats: Optional[List[str]]  # None means "use default (json)"
+    # Parsed once at parse time so execution doesn't re-parse src/dest
+    src_endpoint: Endpoint
+    dest_endpoint: Endpoint
 
 
 WorkflowCommand = Tuple[str, Any]  # ("run", RunCommand) or ("copy", CopyCommand)
 
 
-@dataclass
-class Endpoint:
-    kind: str  # "folder" or "port"
-    folder_name: Optional[str] = None
-    node_name: Optional[str] = None
-    port_name: Optional[str] = None
-
-
 def parse_workflow() -> List[WorkflowCommand]:
     if not WORKFLOW_FILE.is_file():
         raise RunnerError(f"workflow.id not found at: {WORKFLOW_FILE}")
 
     commands: List[WorkflowCommand] = []
-    with WORKFLOW_FILE.open("r", encoding="utf-8") as f:
-        for idx, line in enumerate(f, start=1):
-            raw_line = line.rstrip("\n")
-            stripped = raw_line.strip()
-
-            if not stripped:
-                continue
-            if stripped.startswith("#"):
-                continue
-            if stripped.startswith("@ui:"):
-                break
-
-            if stripped.startswith("run "):
-                cmd = _parse_run_line(idx, raw_line)
-                commands.append(("run", cmd))
-            elif stripped.startswith("copy "):
-                cmd = _parse_copy_line(idx, raw_line)
-                commands.append(("copy", cmd))
-            else:
-                raise RunnerError(
-                    f"Error on line {idx}: unrecognised command '{raw_line.strip()}'."
-                )
+    # One read for the whole file; read_text already normalises newlines.
+    lines = WORKFLOW_FILE.read_text(encoding="utf-8").split("\n")
+    for idx, raw_line in enumerate(lines, start=1):
+        stripped = raw_line.strip()
+
+        if not stripped or stripped[0] == "#":
+            continue
+        if stripped.startswith("@ui:"):
+            break
+
+        entry = _COMMAND_PARSERS.get(stripped[0])
+        if entry is None or not stripped.startswith(entry[0]):
+            raise RunnerError(
+                f"Error on line {idx}: unrecognised command '{stripped}'."
+            )
+        _, kind, parse_line = entry
+        commands.append((kind, parse_line(idx, raw_line)))
 
     return commands
 
@@ -91,6 +90,9 @@ def _parse_run_line(line_no: int, raw: str) -> RunCommand:
     )
 
 
+_COPY_SRC_DEST = re.compile(r"copy\s+(.+?)\s+to\s+(.+)")
+
+
 def _parse_copy_line(line_no: int, raw: str) -> CopyCommand:
     stripped = raw.strip()
     if not stripped.startswith("copy "):
@@ -116,41 +118,60 @@ def _parse_copy_line(line_no: int, raw: str) -> CopyCommand:
 
         resolved_formats: List[str] = []
         for fmt in raw_formats:
-            fmt_lower = fmt.lower()
-            fmt_lower = FORMAT_ALIASES.get(fmt_lower, fmt_lower)
-            if fmt_lower not in SUPPORTED_FORMATS:
+            try:
+                resolved_formats.append(RESOLVED_FORMATS[fmt.lower()])
+            except KeyError:
                 raise RunnerError(
                     f"Error on line {line_no}: unknown export format '{fmt}'."
                 )
-            resolved_formats.append(fmt_lower)
         formats = resolved_formats
 
-    m = re.match(r"^copy\s+(.+?)\s+to\s+(.+)$", left)
-    if not m:
+    # left is "copy <src> to <dest>"; any whitespace may surround "to".
+    m = _COPY_SRC_DEST.fullmatch(left)
+    if m is None:
         raise RunnerError(
             f"Error on line {line_no}: invalid copy command syntax: '{stripped}'."
         )
 
-    src = m.group(1).strip()
-    dest = m.group(2).strip()
+    src = m[1].strip()
+    dest = m[2].strip()
     if not src or not dest:
         raise RunnerError(
             f"Error on line {line_no}: invalid copy command syntax: '{stripped}'."
         )
 
+    try:
+        src_endpoint = parse_endpoint(src)
+        dest_endpoint = parse_endpoint(dest)
+    except RunnerError as e:
+        raise RunnerError(f"Error on line {line_no}: {e}") from e
+
     return CopyCommand(
         line_no=line_no,
         raw=stripped,
         src=src,
         dest=dest,
         formats=formats,
+        src_endpoint=src_endpoint,
+        dest_endpoint=dest_endpoint,
     )
 
 
+# First character of a command line -> (keyword prefix, command kind, line parser)
+_COMMAND_PARSERS: Dict[str, Tuple[str, str, Callable[[int, str], Any]]] = {
+    "r": ("run ", "run", _parse_run_line),
+    "c": ("copy ", "copy", _parse_copy_line),
+}
+
+
+@lru_cache(maxsize=None)
 def parse_endpoint(endpoint: str) -> Endpoint:
     """
     Folder endpoint: "Z"
     Port endpoint: "Node.Port"
+
+    Workflows reference the same ports many times; Endpoint is frozen, so
+    one parsed instance per distinct string is shared.
     """
     if "." in endpoint:
         node_name, port_name = endpoint.split(".", 1)